@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-import json
 import argparse
 import sys
 
+import json_utils
+
 def compress_json(input_source, output_dest=None):
     """
     Compress JSON by removing whitespace and newlines.
@@ -14,23 +15,23 @@ def compress_json(input_source, output_dest=None):
     try:
         # Read input
         if input_source == '-':
-            data = json.load(sys.stdin)
+            raw = sys.stdin.buffer.read()
         else:
-            with open(input_source, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(input_source, 'rb') as f:
+                raw = f.read()
         
         # Compress JSON
-        compressed = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+        compressed = json_utils.dumps(json_utils.loads(raw))
         
         # Write output
         if output_dest:
-            with open(output_dest, 'w', encoding='utf-8') as f:
+            with open(output_dest, 'wb') as f:
                 f.write(compressed)
         else:
-            sys.stdout.write(compressed)
-            sys.stdout.write('\n')  # Add newline for terminal friendliness
+            sys.stdout.buffer.write(compressed)
+            sys.stdout.buffer.write(b'\n')  # Add newline for terminal friendliness
             
-    except json.JSONDecodeError as e:
+    except json_utils.JSONDecodeError as e:
         print(f"Error: Invalid JSON input - {str(e)}", file=sys.stderr)
         sys.exit(1)
     except IOError as e:
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-import json
 import argparse
 import sys
 
+import json_utils
+
 def process_json(input_source, output_dest=None, pretty=False):
     """
     Process JSON file - either compress or prettify it.
@@ -15,28 +16,28 @@ def process_json(input_source, output_dest=None, pretty=False):
     try:
         # Read input
         if input_source == '-':
-            data = json.load(sys.stdin)
+            data = json_utils.loads(sys.stdin.buffer.read())
         else:
-            with open(input_source, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(input_source, 'rb') as f:
+                data = json_utils.loads(f.read())
         
         # Process JSON
         if pretty:
             # Prettify with indentation and nice spacing
-            processed = json.dumps(data, indent=2, ensure_ascii=False, sort_keys=True)
+            processed = json_utils.dumps(data, pretty=True, sort_keys=True)
         else:
             # Compress by removing all unnecessary whitespace
-            processed = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+            processed = json_utils.dumps(data)
         
         # Write output
         if output_dest:
-            with open(output_dest, 'w', encoding='utf-8') as f:
+            with open(output_dest, 'wb') as f:
                 f.write(processed)
         else:
-            sys.stdout.write(processed)
-            sys.stdout.write('\n')
+            sys.stdout.buffer.write(processed)
+            sys.stdout.buffer.write(b'\n')
             
-    except json.JSONDecodeError as e:
+    except json_utils.JSONDecodeError as e:
         print(f"Error: Invalid JSON input - {str(e)}", file=sys.stderr)
         sys.exit(1)
     except IOError as e:
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
-import json
 import argparse
 import re
-from copy import deepcopy
-from typing import Any, Dict, List, Tuple
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Pattern, Tuple
+
+import json_utils
 
 PRUNE_PATTERNS = {
     'react_keys': [
@@ -84,7 +85,7 @@ PRUNE_PATTERNS = {
 }
 
 # Common DOM text node values to prune
-DOM_TEXT_VALUES = [
+DOM_TEXT_VALUES = frozenset([
     '#text',
     '#comment',
     'fulfilled',
@@ -93,7 +94,10 @@ DOM_TEXT_VALUES = [
     '\n',
     'LINK',
     'default'
-]
+])
+
+# Lowercased string spellings of missing values
+NULL_STRINGS = frozenset(['null', 'undefined'])
 
 # CSS-related patterns - both for values and when these are keys
 CSS_PATTERNS = {
@@ -116,122 +120,219 @@ CSS_PATTERNS = {
 }
 
 # Add at the top with other constants
-REMOVE_KEYS = {
+REMOVE_KEYS = frozenset({
     'height',
     'width',
     'constructor',
     'fill',
     'viewBox'
-}
+})
+
+# Compiled patterns shared by every DOMPruner in the process, keyed by pattern source
+_COMPILED_CACHE: Dict[str, Pattern[str]] = {}
+
+def _compile(pattern: str) -> Pattern[str]:
+    """Compile pattern once per process"""
+    compiled = _COMPILED_CACHE.get(pattern)
+    if compiled is None:
+        compiled = _COMPILED_CACHE[pattern] = re.compile(pattern)
+    return compiled
+
+# Stands for "no finished value" and "no next child" in prune_object's walk
+_MISSING = object()
+
+def _always_prune(value: Any) -> bool:
+    """None, booleans and simple numbers are always pruned"""
+    return True
+
+def _is_empty(value: Any) -> bool:
+    return len(value) == 0
+
+def _copy_prefix(container: Any, n: int) -> Any:
+    """Copy the first n entries of a dict or list"""
+    if type(container) is dict:
+        return dict(islice(container.items(), n))
+    return container[:n]
+
+class _PruneFrame:
+    """A container prune_object is part way through"""
+    __slots__ = ('original', 'children', 'pruned', 'kept', 'key', 'child')
+
+    def __init__(self, original: Any, children: Iterator[Any]) -> None:
+        self.original = original
+        # Iterator over the original's items (dicts) or values (lists)
+        self.children = children
+        # Copy holding the kept children, or None while the original can still be shared
+        self.pruned: Any = None
+        # Number of leading children kept unchanged, copied when pruned is made
+        self.kept = 0
+        # Key of the child being pruned (dicts only)
+        self.key: Any = None
+        # Child being pruned, to tell whether it came back unchanged
+        self.child: Any = None
 
 class DOMPruner:
-    def __init__(self, patterns: Dict = PRUNE_PATTERNS):
+    def __init__(self, patterns: Dict[str, Any] = PRUNE_PATTERNS) -> None:
         self.patterns = patterns
         # Add CSS patterns to the main patterns
         self.patterns['css_values'] = CSS_PATTERNS['values']
         self.patterns['css_keys'] = CSS_PATTERNS['keys']
+        # Keys dropped outright along with their values
+        self._removed_keys = REMOVE_KEYS | frozenset(self.patterns['css_keys'])
         self.compile_regex()
+        self._prune_by_type: Dict[type, Callable[[Any], bool]] = {
+            type(None): _always_prune,
+            bool: _always_prune,
+            int: _always_prune,
+            float: _always_prune,
+            json_utils.NonFiniteFloat: _always_prune,
+            str: self._should_prune_str,
+            dict: _is_empty,
+            list: _is_empty,
+        }
+        # Set by prune_object whenever it drops something; run_passes uses it to detect the fixpoint
+        self._changed = False
 
-    def compile_regex(self):
+    def compile_regex(self) -> None:
         self.compiled_patterns = {
-            category: [re.compile(pattern) if isinstance(pattern, str) else pattern
+            category: [_compile(pattern) if isinstance(pattern, str) else pattern
                       for pattern in patterns]
             for category, patterns in self.patterns.items()
             if category != 'css_keys'  # Don't compile simple key matches
         }
+        # One alternation so each class costs a single match call instead of one per pattern
+        self._css_values_union = _compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.patterns['css_values']))
 
-    def should_prune(self, value: Any, key: str = None) -> bool:
+    def should_prune(self, value: Any, key: Optional[str] = None) -> bool:
         # Never prune nodeName values
         if key == 'nodeName':
             return False
         
-        # First check basic types
-        if value is None or value == [] or value == {} or value == '':
+        # One lookup on the exact type instead of a chain of isinstance checks.
+        # Parsed JSON only holds these types; anything else is kept.
+        handler = self._prune_by_type.get(type(value))
+        return handler(value) if handler is not None else False
+
+    def _should_prune_str(self, value: str) -> bool:
+        if value == '':
             return True
+        value = value.strip()
         
-        # Check exact string matches
-        if isinstance(value, str):
-            value = value.strip()
-            
-            # Check DOM text values
-            if value in DOM_TEXT_VALUES:
-                return True
-            
-            # Check string versions of null/undefined
-            if value.lower() in ['null', 'undefined']:
-                return True
-            
-            # Check CSS patterns if it looks like a class string
-            if ' ' in value:  # Multiple classes
-                classes = value.split()
-                # If all classes match CSS patterns, prune it
-                if all(any(pattern.match(cls) for pattern in self.compiled_patterns['css_values'])
-                      for cls in classes):
-                    return True
-                
-        # Prune booleans
-        if isinstance(value, bool):
+        # Check DOM text values
+        if value in DOM_TEXT_VALUES:
             return True
         
-        # Prune simple numbers
-        if isinstance(value, (int, float)):
+        # Check string versions of null/undefined
+        if value.lower() in NULL_STRINGS:
             return True
         
+        # Check CSS patterns if it looks like a class string
+        if ' ' in value:  # Multiple classes
+            # If all classes match CSS patterns, prune it
+            match = self._css_values_union.match
+            if all(match(cls) for cls in value.split()):
+                return True
+        
         return False
 
     def prune_object(self, obj: Any) -> Any:
-        if isinstance(obj, dict):
-            # Check if object has only nodeName property
-            if list(obj.keys()) == ['nodeName']:
-                return None
-            
-            pruned = {}
-            for k, v in obj.items():
-                # Skip keys we want to remove
-                if k in REMOVE_KEYS:
-                    continue
-                
-                # Skip if key matches CSS patterns
-                if k in self.patterns['css_keys']:
-                    continue
-                
-                pruned_value = self.prune_object(v)
-                if pruned_value is not None:
-                    pruned[k] = pruned_value
-                
-            if not pruned or all(self.should_prune(v, k) for k, v in pruned.items()):
-                return None
-            return pruned
-        
-        elif isinstance(obj, list):
-            pruned = [self.prune_object(item) for item in obj 
-                    if not self.should_prune(item)]
-            # Return None if list is empty or only contains prunable values
-            if not pruned or all(self.should_prune(item) for item in pruned):
-                return None
-            return pruned
-        
-        # For non-container values, only prune if explicitly matched
-        if self.should_prune(obj):
-            return None
-        return obj
+        """Prune obj bottom-up in a single walk. Returns None if nothing worth keeping is left."""
+        # Walk with an explicit stack instead of recursion so deep trees cannot hit
+        # the recursion limit. The pruned copy is only made at the first child that
+        # changes; until then the original is shared, so unchanged subtrees cost no
+        # allocations.
+        stack: List[_PruneFrame] = []
+        node: Any = obj
+        value: Any
+        while True:
+            if isinstance(node, dict):
+                # Check if object has only nodeName property
+                if len(node) == 1 and 'nodeName' in node:
+                    self._changed = True
+                    value = None
+                else:
+                    stack.append(_PruneFrame(node, iter(node.items())))
+                    value = _MISSING
+            elif isinstance(node, list):
+                stack.append(_PruneFrame(node, iter(node)))
+                value = _MISSING
+            # For non-container values, only prune if explicitly matched
+            elif self.should_prune(node):
+                if node is not None:
+                    self._changed = True
+                value = None
+            else:
+                value = node
+
+            # Hand finished values to their parents until a frame has another child to visit
+            while True:
+                if not stack:
+                    return value
+                frame = stack[-1]
+                original = frame.original
+                pruned = frame.pruned
+                is_dict = type(original) is dict
+                if value is not _MISSING:
+                    if pruned is None and value is frame.child and value is not None:
+                        frame.kept += 1
+                    else:
+                        if pruned is None:
+                            pruned = frame.pruned = _copy_prefix(original, frame.kept)
+                        if value is None:
+                            self._changed = True
+                        elif is_dict:
+                            pruned[frame.key] = value
+                        else:
+                            pruned.append(value)
+
+                if is_dict:
+                    for k, v in frame.children:
+                        # Skip keys we want to remove, or that match CSS patterns
+                        if k in self._removed_keys:
+                            self._changed = True
+                            if pruned is None:
+                                pruned = frame.pruned = _copy_prefix(original, frame.kept)
+                            continue
+                        frame.key = k
+                        node = v
+                        break
+                    else:
+                        node = _MISSING
+                else:
+                    node = next(frame.children, _MISSING)
+                if node is not _MISSING:
+                    frame.child = node
+                    break
+
+                # Container exhausted. Every kept value survived pruning, so none of them
+                # is prunable on its own and the container only goes away when nothing was kept
+                stack.pop()
+                if pruned is None:
+                    pruned = original
+                if pruned:
+                    value = pruned
+                else:
+                    self._changed = True
+                    value = None
 
-    def run_passes(self, data: Dict, max_passes: int = 10) -> Tuple[Dict, int]:
-        previous = None
-        current = deepcopy(data)
+    def run_passes(self, data: Any, max_passes: int = 10) -> Tuple[Any, int]:
+        # prune_object never mutates its input; unchanged subtrees are shared with it
+        current = data
         passes = 0
         
         while passes < max_passes:
-            previous = deepcopy(current)
+            self._changed = False
             current = self.prune_object(current)
             
-            if json.dumps(previous) == json.dumps(current):
+            # Nothing was dropped, so another pass would return the same tree
+            if not self._changed:
                 break
                 
             passes += 1
         return current, passes
 
-def main():
+def main() -> None:
     parser = argparse.ArgumentParser(description='Prune DOM JSON data')
     parser.add_argument('input', help='Input JSON file')
     parser.add_argument('output', help='Output JSON file')
@@ -240,19 +341,19 @@ def main():
     args = parser.parse_args()
     
     try:
-        with open(args.input, 'r') as f:
-            data = json.load(f)
+        with open(args.input, 'rb') as f:
+            data = json_utils.loads(f.read())
         
         patterns = PRUNE_PATTERNS
         if args.patterns:
-            with open(args.patterns, 'r') as f:
-                patterns = json.load(f)
+            with open(args.patterns, 'rb') as f:
+                patterns = json_utils.loads(f.read())
         
         pruner = DOMPruner(patterns)
         pruned_data, num_passes = pruner.run_passes(data, args.max_passes)
         
-        with open(args.output, 'w') as f:
-            json.dump(pruned_data, f, indent=2)
+        with open(args.output, 'wb') as f:
+            f.write(json_utils.dumps(pruned_data, pretty=True))
             
         print(f"Completed in {num_passes} passes")
         
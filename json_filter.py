@@ -1,34 +1,65 @@
 #!/usr/bin/env python3
-import json
 import argparse
-from typing import Dict, Any, Set
+from typing import Any, List, Set
 from pathlib import Path
 
+import json_utils
+
+# Marks "container just pushed" and "iterator exhausted"; None already means "filtered away"
+_MISSING = object()
+
 class JSONFilter:
-    def __init__(self, include_keys: Set[str]):
+    def __init__(self, include_keys: Set[str]) -> None:
         self.include_keys = include_keys
 
     def filter_object(self, obj: Any) -> Any:
         """Filter object keeping entire subtrees of matched keys."""
-        if isinstance(obj, dict):
-            filtered = {}
-            for key, value in obj.items():
-                # If key is in our include set, keep the entire subtree
-                if key in self.include_keys:
-                    filtered[key] = value  # Keep the entire value without filtering
+        # Frames are [filtered copy, iterator over the original container,
+        # key whose value is being filtered (dicts only)].
+        stack: List[List[Any]] = []
+        node: Any = obj
+        value: Any
+        while True:
+            if isinstance(node, dict):
+                stack.append([{}, iter(node.items()), None])
+                value = _MISSING
+            elif isinstance(node, list):
+                stack.append([[], iter(node), None])
+                value = _MISSING
+            else:
+                value = None
+
+            # Add the finished value to its parent's copy, then resume the parent
+            while True:
+                if not stack:
+                    return value
+                frame = stack[-1]
+                filtered = frame[0]
+                if value is not None and value is not _MISSING:
+                    if type(filtered) is dict:
+                        filtered[frame[2]] = value
+                    else:
+                        filtered.append(value)
+
+                if type(filtered) is dict:
+                    for key, child in frame[1]:
+                        # If key is in our include set, keep the entire subtree
+                        if key in self.include_keys:
+                            filtered[key] = child  # Keep the entire value without filtering
+                            continue
+                        # Otherwise, continue filtering deeper
+                        frame[2] = key
+                        node = child
+                        break
+                    else:
+                        node = _MISSING
                 else:
-                    # Otherwise, continue filtering deeper
-                    filtered_value = self.filter_object(value)
-                    if filtered_value is not None:
-                        filtered[key] = filtered_value
-            return filtered if filtered else None
-            
-        elif isinstance(obj, list):
-            filtered = [self.filter_object(item) for item in obj]
-            filtered = [item for item in filtered if item is not None]
-            return filtered if filtered else None
-            
-        return None
+                    node = next(frame[1], _MISSING)
+                if node is not _MISSING:
+                    break
+
+                stack.pop()
+                value = filtered if filtered else None
 
 def load_keys_from_file(keys_file: Path) -> Set[str]:
     """Load keys from a text file, one key per line."""
@@ -36,7 +67,7 @@ def load_keys_from_file(keys_file: Path) -> Set[str]:
         # Strip whitespace and ignore empty lines
         return {line.strip() for line in f if line.strip()}
 
-def main():
+def main() -> None:
     parser = argparse.ArgumentParser(description='Filter JSON based on keys')
     parser.add_argument('input', type=Path, help='Input JSON file')
     parser.add_argument('keys', type=Path, help='Text file with keys to keep (one per line)')
@@ -45,8 +76,8 @@ def main():
     
     try:
         # Load input JSON
-        with open(args.input, 'r') as f:
-            data = json.load(f)
+        with open(args.input, 'rb') as f:
+            data = json_utils.loads(f.read())
             
         # Load keys from file
         include_keys = load_keys_from_file(args.keys)
@@ -57,8 +88,8 @@ def main():
         filtered = filter.filter_object(data)
         
         # Write output
-        with open(args.output, 'w') as f:
-            json.dump(filtered, f, indent=2)
+        with open(args.output, 'wb') as f:
+            f.write(json_utils.dumps(filtered, pretty=True))
             
         print(f"Filtered JSON written to {args.output}")
         
@@ -1,37 +1,70 @@
 #!/usr/bin/env python3
-import json
 import argparse
 from typing import Dict, Any, List
 from pathlib import Path
-from collections import defaultdict
+
+import json_utils
+
+def _has_single_spelling(key: str) -> bool:
+    """True if JSON text can only write key as itself, apart from \\u escapes."""
+    # JSON may also escape '"', '\' and '/', and must escape control characters
+    return all(' ' <= ch <= '~' and ch not in '"\\/' for ch in key)
 
 class JSONObjectFinder:
     def __init__(self, search_keys: List[str]):
         self.search_keys = search_keys
-        self.findings = defaultdict(list)
+        # One list per search key up front; also serves as the key lookup while walking
+        self.findings = {key: [] for key in search_keys}
         
-    def find_objects(self, obj: Any, path: List[str] = None) -> None:
-        """Recursively find all instances of specified objects."""
-        if path is None:
-            path = []
-            
+    def may_contain_keys(self, raw: bytes) -> bool:
+        """Cheap check on undecoded JSON: False only if no search key can occur in it."""
+        # A key with a single spelling can only occur as itself, unless the
+        # document uses \u escapes, so a byte search for it is exact. Any other
+        # key has to be parsed.
+        for key in self.search_keys:
+            if not _has_single_spelling(key):
+                return True
+            if b'"' + key.encode() + b'"' in raw:
+                return True
+        return b'\\u' in raw
+
+    def find_objects(self, obj: Any) -> None:
+        """Find all instances of specified objects, in document order."""
+        # Stack of children iterators. List children are (index, item) pairs;
+        # an int index never matches a search key.
         if isinstance(obj, dict):
-            for key, value in obj.items():
-                current_path = path + [key]
-                
+            stack = [iter(obj.items())]
+        elif isinstance(obj, list):
+            stack = [enumerate(obj)]
+        else:
+            return
+        
+        # Keys leading to the container on top of the stack, joined only on a match
+        path = []
+        findings = self.findings
+        while stack:
+            for key, value in stack[-1]:
                 # If this is a key we're looking for, store the value
-                if key in self.search_keys:
-                    self.findings[key].append({
+                instances = findings.get(key)
+                if instances is not None:
+                    instances.append({
                         'value': value,
-                        'path': '/'.join(map(str, current_path))
+                        'path': '/'.join(map(str, path + [key]))
                     })
                 
-                # Continue searching in this value
-                self.find_objects(value, current_path)
-                
-        elif isinstance(obj, list):
-            for i, item in enumerate(obj):
-                self.find_objects(item, path + [str(i)])
+                # Continue searching in this value before moving on to its siblings
+                if isinstance(value, dict):
+                    stack.append(iter(value.items()))
+                    path.append(key)
+                    break
+                if isinstance(value, list):
+                    stack.append(enumerate(value))
+                    path.append(key)
+                    break
+            else:
+                stack.pop()
+                if stack:
+                    path.pop()
 
     def print_findings(self):
         """Print findings in a structured format."""
@@ -45,7 +78,7 @@ class JSONObjectFinder:
                     print(f"\nInstance {i}:")
                     print(f"Path: {instance['path']}")
                     print("Content:")
-                    print(json.dumps(instance['value'], indent=2))
+                    print(json_utils.dumps(instance['value'], pretty=True).decode('utf-8'))
             else:
                 print(f"\nNo instances of '{key}' found.")
 
@@ -53,6 +86,9 @@ def main():
     parser = argparse.ArgumentParser(description='Find specific objects in JSON')
     parser.add_argument('input', type=Path, help='Input JSON file')
     parser.add_argument('--objects', type=str, help='Comma-separated list of object names to find')
+    parser.add_argument('--skip-unmatched', action='store_true',
+                        help="Don't parse files in which no search key can occur; "
+                             'such files are not checked for valid JSON')
     args = parser.parse_args()
     
     try:
@@ -60,13 +96,14 @@ def main():
         search_keys = [key.strip() for key in args.objects.split(',')]
         print(f"Searching for objects: {', '.join(search_keys)}")
         
-        # Load input JSON
-        with open(args.input, 'r') as f:
-            data = json.load(f)
+        with open(args.input, 'rb') as f:
+            raw = f.read()
         
-        # Create finder and process
+        # Create finder and process. Parsing also reports malformed input, so it
+        # is only skipped on request.
         finder = JSONObjectFinder(search_keys)
-        finder.find_objects(data)
+        if not args.skip_unmatched or finder.may_contain_keys(raw):
+            finder.find_objects(json_utils.loads(raw))
         finder.print_findings()
         
     except Exception as e:
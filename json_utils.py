@@ -0,0 +1,66 @@
+"""JSON helpers shared by the tools: use orjson when installed, stdlib json otherwise."""
+import json
+import re
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one handler covers both
+JSONDecodeError = json.JSONDecodeError
+
+# orjson turns integers outside the 64-bit range into floats. Any such integer
+# has at least 19 digits, so documents with a run that long go to stdlib json,
+# which keeps integers exact. The search does not skip strings, so a document
+# that merely holds a long numeric ID or nanosecond timestamp as text is also
+# parsed by the slower stdlib json; the result is the same either way.
+_WIDE_INT = re.compile(rb'[0-9]{19}')
+
+class NonFiniteFloat(float):
+    """NaN or an infinity read by loads, which dumps writes back as read."""
+    # orjson writes NaN and infinities as null but refuses float subclasses,
+    # so documents holding one of these are left to stdlib json
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        try:
+            raw = data.encode('utf-8') if isinstance(data, str) else data
+            if _WIDE_INT.search(raw) is None:
+                return orjson.loads(raw)
+        except (UnicodeEncodeError, orjson.JSONDecodeError):
+            # orjson rejects lone surrogates and NaN/Infinity, which stdlib json
+            # accepts. Documents that are really invalid get reported below.
+            pass
+    return json.loads(data, parse_constant=NonFiniteFloat)
+
+def dumps(obj: Any, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 encoded JSON bytes.
+
+    Args:
+        obj: Data to serialize
+        pretty: If True, indent with 2 spaces. If False, compact separators
+        sort_keys: If True, sort dictionary keys
+    """
+    if orjson is not None:
+        option = 0
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option)
+        except orjson.JSONEncodeError:
+            # Integers wider than 64 bits, lone surrogates or NaN/Infinity;
+            # stdlib json writes them all
+            pass
+
+    layout: Dict[str, Any] = {'indent': 2} if pretty else {'separators': (',', ':')}
+    try:
+        return json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys, **layout).encode('utf-8')
+    except UnicodeEncodeError:
+        # Lone surrogates have no UTF-8 form, so write them as \u escapes
+        return json.dumps(obj, sort_keys=sort_keys, **layout).encode('utf-8')
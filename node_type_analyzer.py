@@ -1,60 +1,86 @@
-from collections import defaultdict
-import json
+from collections import Counter
 import sys
 import argparse
 
+import json_utils
+
 class DOMNodeAnalyzer:
     def __init__(self):
-        self.key_stats = defaultdict(lambda: {
-            'count': 0,
-            'samples': []  # Will keep 3 sample values
-        })
+        self.key_counts = Counter()
+        self.key_samples = {}  # Will keep 3 sample values per key
         self.max_samples = 3
+        # Keys that already have max_samples samples
+        self._sampled_keys = set()
 
-    def traverse(self, data, path=None):
-        if path is None:
-            path = []
-            
+    def traverse(self, data):
+        # Keys of every dict we visit, counted in one C-level pass at the end
+        keys = []
+        sampled = self._sampled_keys
+        
+        # Stack of (children iterator, needs_samples). A dict whose keys all have
+        # their samples already needs no per-key work.
+        if isinstance(data, dict):
+            keys.extend(data)
+            stack = [(iter(data.items()), not sampled.issuperset(data))]
+        elif isinstance(data, list):
+            stack = [(enumerate(data), False)]
+        else:
+            return
+        
+        # Keys and indices leading to the container on top of the stack
+        path = []
         try:
-            if isinstance(data, dict):
-                # Track each key we find
-                for key, value in data.items():
-                    stats = self.key_stats[key]
-                    stats['count'] += 1
-                    
+            while stack:
+                children, needs_samples = stack[-1]
+                for key, value in children:
                     # Keep up to 3 sample values
-                    if len(stats['samples']) < self.max_samples:
+                    if needs_samples and key not in sampled:
+                        samples = self.key_samples.setdefault(key, [])
                         sample = {
                             'value': value,
-                            'path': '/'.join(str(p) for p in path + [key])
+                            'path': '/'.join(map(str, path + [key]))
                         }
-                        if sample not in stats['samples']:
-                            stats['samples'].append(sample)
-                            
-                    # Continue traversing
-                    self.traverse(value, path + [key])
+                        if sample not in samples:
+                            samples.append(sample)
+                            if len(samples) >= self.max_samples:
+                                sampled.add(key)
                     
-            elif isinstance(data, list):
-                for i, value in enumerate(data):
-                    self.traverse(value, path + [str(i)])
+                    # Continue traversing before moving on to the siblings
+                    if isinstance(value, dict):
+                        keys.extend(value)
+                        stack.append((iter(value.items()), not sampled.issuperset(value)))
+                        path.append(key)
+                        break
+                    if isinstance(value, list):
+                        stack.append((enumerate(value), False))
+                        path.append(key)
+                        break
+                else:
+                    stack.pop()
+                    if stack:
+                        path.pop()
                     
         except Exception:
             pass
+        
+        # Track each key we found
+        self.key_counts.update(keys)
 
     def print_analysis(self):
         print("\nKey Analysis")
         print("=" * 50)
         
         # Sort by frequency
-        sorted_keys = sorted(self.key_stats.items(), 
-                           key=lambda x: (-x[1]['count'], x[0]))
+        sorted_keys = sorted(self.key_counts.items(), 
+                           key=lambda x: (-x[1], x[0]))
         
-        for key, stats in sorted_keys:
+        for key, count in sorted_keys:
             print(f"\nKey: {key}")
-            print(f"Count: {stats['count']}")
-            if stats['samples']:
+            print(f"Count: {count}")
+            samples = self.key_samples.get(key)
+            if samples:
                 print("Sample values:")
-                for sample in stats['samples']:
+                for sample in samples:
                     print(f"  At {sample['path']}:")
                     print(f"  → {str(sample['value'])[:100]}")
                     if len(str(sample['value'])) > 100:
@@ -66,8 +92,8 @@ def main():
     args = parser.parse_args()
     
     try:
-        with open(args.input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(args.input_file, 'rb') as f:
+            data = json_utils.loads(f.read())
         
         analyzer = DOMNodeAnalyzer()
         analyzer.traverse(data)
@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
-import json
 from pathlib import Path
-from typing import Dict, Any, List
-from copy import deepcopy
+from typing import Dict, Any, Iterator, List, Tuple
+
+import json_utils
 
 def get_chunk_size(data) -> int:
     """Get size in bytes of JSON data when serialized"""
-    return len(json.dumps(data, separators=(',', ':')).encode())
+    return len(json_utils.dumps(data))
 
 class JSONSplitter:
     def __init__(self, output_dir: Path, max_size_bytes: int):
@@ -14,12 +14,11 @@ class JSONSplitter:
         self.max_size = max_size_bytes
         self.chunk_num = 1
 
-    def write_chunk(self, chunk: Dict[str, Any]):
-        """Write a chunk of data to a file"""
+    def write_chunk(self, chunk: Dict[str, Any], size: int):
+        """Write a chunk of data to a file; size is its compact serialized size"""
         outfile = self.output_dir / f"chunk_{self.chunk_num}.json"
-        with open(outfile, 'w') as f:
-            json.dump(chunk, f, indent=2)
-        size = get_chunk_size(chunk)
+        with open(outfile, 'wb') as f:
+            f.write(json_utils.dumps(chunk, pretty=True))
         print(f"Wrote chunk {self.chunk_num}: {size/1024/1024:.2f}MB")
         self.chunk_num += 1
 
@@ -40,94 +39,94 @@ class JSONSplitter:
             chunks.append(chunk)
         return chunks
 
-    def split_array(self, array: List[Any], base_structure: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Split an array while maintaining the base structure"""
-        chunks = []
+    def split_array(self, array: List[Any], base_structure: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """Split an array while maintaining the base structure, yielding (chunk, compact size)"""
         current_chunk = []
         
+        # Chunks only read base_structure, so they can share it through shallow copies.
+        # A compact chunk's size is the base with empty children plus each item's
+        # size plus a comma between items, so it is tracked without reserializing.
+        base_size = get_chunk_size({**base_structure, 'children': []})
+        current_size = base_size
+        
         for item in array:
-            if isinstance(item, dict) and self.needs_splitting(item):
+            # Serialized once and used both to decide on splitting and for the running size
+            item_size = get_chunk_size(item)
+            if isinstance(item, dict) and item_size > self.max_size:
                 # If we have accumulated items, create a chunk
                 if current_chunk:
-                    new_structure = deepcopy(base_structure)
-                    new_structure['children'] = current_chunk
-                    chunks.append(new_structure)
+                    yield {**base_structure, 'children': current_chunk}, current_size
                     current_chunk = []
+                    current_size = base_size
                 
                 # Process the large item
-                item_chunks = self.split_dict(item)
-                for item_chunk in item_chunks:
-                    new_structure = deepcopy(base_structure)
-                    new_structure['children'] = [item_chunk]
-                    chunks.append(new_structure)
+                for item_chunk, chunk_size in self.split_dict(item):
+                    yield {**base_structure, 'children': [item_chunk]}, base_size + chunk_size
             else:
-                current_chunk.append(item)
+                separator = 1 if current_chunk else 0
                 
-                # Check if current_chunk exceeds max size
-                temp_structure = deepcopy(base_structure)
-                temp_structure['children'] = current_chunk
-                if get_chunk_size(temp_structure) > self.max_size:
-                    # Remove last item and create chunk
-                    current_chunk.pop()
-                    new_structure = deepcopy(base_structure)
-                    new_structure['children'] = current_chunk
-                    chunks.append(new_structure)
-                    current_chunk = [item]
+                # Start a new chunk if this item would push the current one over max size
+                if current_chunk and current_size + separator + item_size > self.max_size:
+                    yield {**base_structure, 'children': current_chunk}, current_size
+                    current_chunk = []
+                    current_size = base_size
+                    separator = 0
+                
+                current_chunk.append(item)
+                current_size += separator + item_size
         
         # Handle remaining items
         if current_chunk:
-            new_structure = deepcopy(base_structure)
-            new_structure['children'] = current_chunk
-            chunks.append(new_structure)
-        
-        return chunks
+            yield {**base_structure, 'children': current_chunk}, current_size
 
-    def split_dict(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Split a dictionary into chunks"""
-        if not self.needs_splitting(data):
-            return [data]
+    def split_dict(self, data: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """Split a dictionary into chunks, yielding each one with its compact size as soon as it is built"""
+        size = get_chunk_size(data)
+        if size <= self.max_size:
+            yield data, size
+            return
 
-        base_structure = {}
-        chunks = [deepcopy(data)]
+        # Oversized values we know how to split. Each one is split on its own while
+        # every chunk keeps the remaining values, so the number of chunks is the sum
+        # of the pieces rather than their product.
+        split_keys = [
+            key for key, value in data.items()
+            if self.needs_splitting(value) and (
+                isinstance(value, (str, dict)) or
+                (isinstance(value, list) and key == 'children'))
+        ]
+        if not split_keys:
+            yield data, size
+            return
         
-        for key, value in data.items():
-            if self.needs_splitting(value):
-                if isinstance(value, str):
-                    # Handle large string values
-                    string_chunks = self.split_string(value)
-                    new_chunks = []
-                    for chunk in string_chunks:
-                        for existing_chunk in chunks:
-                            new_chunk = deepcopy(existing_chunk)
-                            new_chunk[key] = chunk
-                            new_chunks.append(new_chunk)
-                    chunks = new_chunks
-                
-                elif isinstance(value, list):
-                    # Handle arrays (especially for the children field)
-                    if key == 'children':
-                        base_structure = {k: v for k, v in data.items() if k != 'children'}
-                        chunks = self.split_array(value, base_structure)
-                
-                elif isinstance(value, dict):
-                    # Handle nested dictionaries
-                    nested_chunks = self.split_dict(value)
-                    if len(nested_chunks) > 1:
-                        new_chunks = []
-                        for nested_chunk in nested_chunks:
-                            for existing_chunk in chunks:
-                                new_chunk = deepcopy(existing_chunk)
-                                new_chunk[key] = nested_chunk
-                                new_chunks.append(new_chunk)
-                        chunks = new_chunks
-
-        return chunks
+        for key in split_keys:
+            value = data[key]
+            # The other oversized values are covered by their own chunks. Chunks are
+            # only serialized, so they share everything else with data.
+            base_structure = {k: v for k, v in data.items() if k == key or k not in split_keys}
+            
+            if isinstance(value, str):
+                # Handle large string values. A chunk serializes as the base with
+                # key empty plus its piece, so only the piece is measured.
+                empty_size = get_chunk_size({**base_structure, key: ''}) - 2
+                for chunk in self.split_string(value):
+                    yield {**base_structure, key: chunk}, empty_size + get_chunk_size(chunk)
+            
+            elif isinstance(value, list):
+                # Handle arrays (especially for the children field)
+                del base_structure[key]
+                yield from self.split_array(value, base_structure)
+            
+            else:
+                # Handle nested dictionaries, measured like the string pieces
+                empty_size = get_chunk_size({**base_structure, key: {}}) - 2
+                for nested_chunk, nested_size in self.split_dict(value):
+                    yield {**base_structure, key: nested_chunk}, empty_size + nested_size
 
     def process(self, data: Dict[str, Any]):
-        """Process the input data and write chunks"""
-        chunks = self.split_dict(data)
-        for chunk in chunks:
-            self.write_chunk(chunk)
+        """Process the input data, writing each chunk as soon as it is split off"""
+        for chunk, size in self.split_dict(data):
+            self.write_chunk(chunk, size)
 
 def main():
     import argparse
@@ -141,8 +140,8 @@ def main():
     output_dir = Path(args.output_dir)
     output_dir.mkdir(exist_ok=True)
     
-    with open(args.input) as f:
-        data = json.load(f)
+    with open(args.input, 'rb') as f:
+        data = json_utils.loads(f.read())
     
     max_bytes = int(args.max_size * 1024 * 1024)
     splitter = JSONSplitter(output_dir, max_bytes)
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import json_utils
+from json_object_finder import JSONObjectFinder
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def find(raw, keys):
+    """Run the finder the way main does with --skip-unmatched."""
+    finder = JSONObjectFinder(keys)
+    if finder.may_contain_keys(raw):
+        finder.find_objects(json_utils.loads(raw))
+    return finder.findings
+
+class MayContainKeysTest(unittest.TestCase):
+    def test_escaped_slash_in_key(self):
+        raw = b'{"x": {"data\\/src": {"v": 1}}}'
+        self.assertEqual(find(raw, ['data/src']),
+                         {'data/src': [{'value': {'v': 1}, 'path': 'x/data/src'}]})
+
+    def test_escaped_control_character_in_key(self):
+        raw = b'{"a\\tb": 1}'
+        self.assertEqual(find(raw, ['a\tb']), {'a\tb': [{'value': 1, 'path': 'a\tb'}]})
+
+    def test_absent_plain_key_skips_parsing(self):
+        finder = JSONObjectFinder(['href'])
+        self.assertFalse(finder.may_contain_keys(b'{"src": "/a/b"}'))
+        self.assertTrue(finder.may_contain_keys(b'{"\\u0068ref": 1}'))
+
+    def test_malformed_input_reported_by_default(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bad.json')
+            with open(path, 'wb') as f:
+                f.write(b'{"a": 1, "b": [1,2')
+            command = [sys.executable, 'json_object_finder.py', path, '--objects', 'foo']
+            result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+            self.assertEqual(result.returncode, 1)
+            self.assertIn('Error:', result.stdout)
+
+            result = subprocess.run(command + ['--skip-unmatched'], cwd=ROOT,
+                                    capture_output=True, text=True)
+            self.assertEqual(result.returncode, 0)
+            self.assertIn("No instances of 'foo' found.", result.stdout)
+
+if __name__ == '__main__':
+    unittest.main()
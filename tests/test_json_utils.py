@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import json_utils
+from compress_json import compress_json
+from decompress_json import process_json
+
+WIDE_INTS = b'{"id": 123456789012345678901234, "low": -9223372036854775809, "n": 5}'
+NON_FINITE = b'{"a": NaN, "b": Infinity, "c": -Infinity, "d": 1.5}'
+
+class WideIntegerTest(unittest.TestCase):
+    def test_loads_keeps_wide_integers_exact(self):
+        data = json_utils.loads(WIDE_INTS)
+        self.assertEqual(data['id'], 123456789012345678901234)
+        self.assertEqual(data['low'], -9223372036854775809)
+
+    def test_dumps_writes_wide_integers(self):
+        self.assertEqual(json_utils.dumps({'id': 2 ** 70}), b'{"id":1180591620717411303424}')
+
+    def test_compress_decompress_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / 'input.json'
+            compressed = Path(tmp) / 'compressed.json'
+            readable = Path(tmp) / 'readable.json'
+            source.write_bytes(WIDE_INTS)
+
+            compress_json(str(source), str(compressed))
+            self.assertEqual(compressed.read_bytes(),
+                             b'{"id":123456789012345678901234,"low":-9223372036854775809,"n":5}')
+
+            process_json(str(compressed), str(readable), pretty=True)
+            self.assertEqual(json_utils.loads(readable.read_bytes()), json_utils.loads(WIDE_INTS))
+            self.assertIn(b'"id": 123456789012345678901234', readable.read_bytes())
+
+class NonFiniteFloatTest(unittest.TestCase):
+    def test_dumps_writes_non_finite_floats_back(self):
+        data = json_utils.loads(NON_FINITE)
+        self.assertEqual(json_utils.dumps(data), b'{"a":NaN,"b":Infinity,"c":-Infinity,"d":1.5}')
+        self.assertIn(b'"b": Infinity', json_utils.dumps(data, pretty=True))
+
+    def test_compress_decompress_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / 'input.json'
+            compressed = Path(tmp) / 'compressed.json'
+            readable = Path(tmp) / 'readable.json'
+            source.write_bytes(NON_FINITE)
+
+            compress_json(str(source), str(compressed))
+            self.assertEqual(compressed.read_bytes(),
+                             b'{"a":NaN,"b":Infinity,"c":-Infinity,"d":1.5}')
+
+            process_json(str(compressed), str(readable), pretty=True)
+            self.assertIn(b'"a": NaN', readable.read_bytes())
+            self.assertIn(b'"c": -Infinity', readable.read_bytes())
+
+class LoneSurrogateTest(unittest.TestCase):
+    def test_loads_accepts_lone_surrogates(self):
+        self.assertEqual(json_utils.loads(b'{"s": "a\\ud800b"}'), {'s': 'a\ud800b'})
+
+    def test_dumps_escapes_lone_surrogates(self):
+        for pretty in (False, True):
+            dumped = json_utils.dumps({'s': 'a\ud800b'}, pretty=pretty)
+            self.assertIn(b'\\ud800', dumped)
+            self.assertEqual(json_utils.loads(dumped), {'s': 'a\ud800b'})
+
+    def test_invalid_json_still_raises(self):
+        with self.assertRaises(json_utils.JSONDecodeError):
+            json_utils.loads(b'{"s": ')
+
+if __name__ == '__main__':
+    unittest.main()
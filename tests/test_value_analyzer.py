@@ -0,0 +1,89 @@
+import os
+import random
+import subprocess
+import sys
+import unittest
+
+from value_analyzer import ValueAnalyzer
+
+SCRIPT = '''
+from value_analyzer import _ngram_signature
+print(sorted(_ngram_signature('abcdefghij/.' * 100)))
+'''
+
+def parse_events(obj, prefix=''):
+    """The (prefix, event, value) triples ijson.parse yields for obj."""
+    if isinstance(obj, dict):
+        yield prefix, 'start_map', None
+        for key, value in obj.items():
+            yield prefix, 'map_key', key
+            yield from parse_events(value, f'{prefix}.{key}' if prefix else key)
+        yield prefix, 'end_map', None
+    elif isinstance(obj, list):
+        yield prefix, 'start_array', None
+        for value in obj:
+            yield from parse_events(value, f'{prefix}.item' if prefix else 'item')
+        yield prefix, 'end_array', None
+    elif obj is None:
+        yield prefix, 'null', None
+    elif isinstance(obj, bool):
+        yield prefix, 'boolean', obj
+    elif isinstance(obj, str):
+        yield prefix, 'string', obj
+    else:
+        yield prefix, 'number', obj
+
+def random_tree(rng, depth=0):
+    kind = rng.random()
+    if depth > 4 or kind < 0.4:
+        return rng.choice(['a/b', 'x.y', 'plain', '', 'http', 7, 1.5, None, True, 'z' * 60])
+    if kind < 0.7:
+        return [random_tree(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return {rng.choice(['', 'k', 'a.b', 'item', '0', 'c/d']) + str(i): random_tree(rng, depth + 1)
+            for i in range(rng.randrange(4))}
+
+class TraverseEventsTest(unittest.TestCase):
+    def assertSameFindings(self, data):
+        loaded = ValueAnalyzer()
+        loaded.traverse(data)
+        streamed = ValueAnalyzer()
+        streamed.traverse_events(parse_events(data))
+        self.assertEqual(dict(streamed.findings), dict(loaded.findings), data)
+
+    def test_matches_traverse(self):
+        for data in ['x/y', 5, None, [], {}, {'': 'a/b', 'k.k': {'': ['c.d']}},
+                     [['a/b', {'k.k': ['c.d', [], {'z': 'e/f'}]}], 'g.h'],
+                     {'a': [[[]], 'q.r', [[{'item': 'i.j'}]]]}]:
+            self.assertSameFindings(data)
+
+    def test_matches_traverse_on_random_trees(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            self.assertSameFindings(random_tree(rng))
+
+class NearDuplicatesTest(unittest.TestCase):
+    def test_same_signature_whatever_the_hash_seed(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        outputs = set()
+        for seed in ('1', '2', '3'):
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            outputs.add(subprocess.run([sys.executable, '-c', SCRIPT], cwd=root, env=env,
+                                       capture_output=True, text=True, check=True).stdout)
+        self.assertEqual(len(outputs), 1)
+
+    def test_lone_surrogates(self):
+        analyzer = ValueAnalyzer()
+        surrogates = ''.join(chr(0xd800 + i * 7 % 1024) for i in range(1100))
+        for i in range(2):
+            analyzer.findings[surrogates + str(i)].append(str(i))
+        self.assertEqual(len(analyzer.near_duplicates()), 1)
+
+    def test_repetitive_values(self):
+        analyzer = ValueAnalyzer()
+        for value in ('a' * 2000, 'ab' * 1000, 'a' * 2001, 'ab' * 1001):
+            analyzer.findings[value].append('x')
+        self.assertEqual(analyzer.near_duplicates(),
+                         [['a' * 2000, 'a' * 2001], ['ab' * 1000, 'ab' * 1001]])
+
+if __name__ == '__main__':
+    unittest.main()
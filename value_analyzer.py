@@ -1,87 +1,209 @@
-import json
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
 import argparse
 import sys
-import re
+import zlib
+from typing import Any, DefaultDict, Deque, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import json_utils
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # type: ignore
+
+def _is_interesting(value: Any) -> bool:
+    """Much simpler check - just look for long strings, paths, URLs, or files."""
+    if not isinstance(value, str):
+        return False
+        
+    value = value.strip()
+    if not value:
+        return False
+    
+    # The first character rules out most prefix tests without a method call
+    first = value[0]
+    
+    # Skip React/technical stuff
+    if (first == '_' and value.startswith('__')) or (first == '[' and value.startswith('[object')):
+        return False
+        
+    # Capture any of these ('/api' URLs are already caught as paths):
+    return (len(value) > 50 or                    # Long strings
+            '/' in value or                       # Paths
+            '.' in value or                       # Possible files/extensions
+            (first == 'h' and value.startswith('http')))  # URLs
+
+# Near-duplicate detection compares values at least this long by their n-grams
+NEAR_DUPLICATE_MIN_LENGTH = 1024
+NGRAM_SIZE = 32
+# Only n-grams whose hash is 0 modulo this are kept, so signatures stay small.
+# Equal n-grams hash alike, so two values keep the same sample of what they share.
+NGRAM_SAMPLE = 8
+# Values whose sample is smaller than this keep all their distinct n-grams instead
+NGRAM_MIN_SAMPLE = 16
+# Share of the smaller signature two values must have in common to be clustered
+NEAR_DUPLICATE_THRESHOLD = 0.5
+
+def _ngram_signature(value: str) -> Set[int]:
+    """Sampled hashes of the NGRAM_SIZE-character windows of value, or all of them if few."""
+    # CRC32 rather than hash(), which is salted per process and would sample
+    # different n-grams, and so cluster differently, on every run. Checksumming
+    # each slice in C also beats a rolling hash updated in Python. surrogatepass
+    # keeps lone surrogates, which JSON strings may contain, encodable.
+    windows = range(len(value) - NGRAM_SIZE + 1)
+    signature = {h for h in (zlib.crc32(value[i:i + NGRAM_SIZE].encode('utf-8', 'surrogatepass'))
+                             for i in windows)
+                 if h % NGRAM_SAMPLE == 0}
+    if len(signature) < NGRAM_MIN_SAMPLE:
+        # Repeated markup or padding has so few distinct n-grams that the sample
+        # is often empty, and such a value could never be clustered. The few
+        # there are make a small enough signature on their own.
+        signature = {zlib.crc32(value[i:i + NGRAM_SIZE].encode('utf-8', 'surrogatepass'))
+                     for i in windows}
+    return signature
 
 class ValueAnalyzer:
-    def __init__(self):
-        self.findings = defaultdict(list)
-        self.extension_pattern = re.compile(r'\.[a-zA-Z0-9]{2,4}$')
+    def __init__(self) -> None:
+        # Interesting value -> paths where it was found. Equal values share one key,
+        # so each distinct string is stored once whatever its number of occurrences.
+        self.findings: DefaultDict[str, List[str]] = defaultdict(list)
         
-    def is_interesting(self, value):
-        """Much simpler check - just look for long strings, paths, URLs, or files."""
-        if not isinstance(value, str):
-            return False
+    # Kept free of self so traverse can call it through a local name
+    is_interesting = staticmethod(_is_interesting)
+    
+    def traverse(self, data: Any, path: Optional[Sequence[Any]] = None) -> None:
+        # Stack of (children iterator, path prefix). List children are (index, item)
+        # pairs. The prefix is the container's joined path plus '/' ('' at the root),
+        # so a child's path is a single concatenation.
+        prefix = ''.join(f'{p}/' for p in path) if path else ''
+        stack: Deque[Tuple[Iterator[Tuple[Any, Any]], str]]
+        if isinstance(data, dict):
+            stack = deque([(iter(data.items()), prefix)])
+        elif isinstance(data, list):
+            stack = deque([(enumerate(data), prefix)])
+        else:
+            return
             
-        value = str(value).strip()
+        is_interesting = _is_interesting
+        findings = self.findings
+        while stack:
+            children, prefix = stack[-1]
+            for key, value in children:
+                # Exact type checks are the cheapest way to tell strings, containers
+                # and other leaves apart; parsed JSON holds no subclasses
+                kind = type(value)
+                if kind is str:
+                    if is_interesting(value):
+                        findings[value].append(f'{prefix}{key}')
+                    continue
+                # Visit this value's children before its siblings
+                if kind is dict:
+                    stack.append((iter(value.items()), f'{prefix}{key}/'))
+                    break
+                if kind is list:
+                    stack.append((enumerate(value), f'{prefix}{key}/'))
+                    break
+            else:
+                stack.pop()
+
+    def traverse_events(self, events: Iterable[Tuple[str, str, Any]]) -> None:
+        """Same findings as traverse, from ijson.parse events instead of a loaded document."""
+        # One entry per open container: the current key of a dict (None before the
+        # first key) or the index of the current array element (-1 before the first).
+        # ijson's own prefix cannot be used, it spells every array index as 'item'.
+        path: List[Any] = []
+        is_interesting = _is_interesting
+        findings = self.findings
+        for _, event, value in events:
+            if event == 'map_key':
+                path[-1] = value
+                continue
+            if event == 'end_map' or event == 'end_array':
+                path.pop()
+                continue
+                
+            # Every other event starts a value, which numbers it inside an array
+            if path and type(path[-1]) is int:
+                path[-1] += 1
+            if event == 'start_map':
+                path.append(None)
+            elif event == 'start_array':
+                path.append(-1)
+            elif event == 'string' and path and is_interesting(value):
+                findings[value].append('/'.join(map(str, path)))
+
+    def near_duplicates(self) -> List[List[str]]:
+        """Group distinct long values that share most of their n-grams, in the order found."""
+        values = [value for value in self.findings if len(value) >= NEAR_DUPLICATE_MIN_LENGTH]
+        signatures = [_ngram_signature(value) for value in values]
         
-        # Skip React/technical stuff
-        if value.startswith('__') or value.startswith('[object'):
-            return False
-            
-        # Capture any of these:
-        return (len(value) > 50 or                    # Long strings
-                '/' in value or                       # Paths
-                '.' in value or                       # Possible files/extensions
-                value.startswith(('http', '/api')))   # URLs
+        # n-gram hash -> indices of the values containing it
+        index: DefaultDict[int, List[int]] = defaultdict(list)
+        for i, signature in enumerate(signatures):
+            for h in signature:
+                index[h].append(i)
                 
-    def traverse(self, data, path=None):
-        if path is None:
-            path = []
+        # Union-find over values whose shared n-grams cover enough of the smaller signature
+        parent = list(range(len(values)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
             
-        try:
-            if isinstance(data, dict):
-                for key, value in data.items():
-                    if self.is_interesting(value):
-                        self.findings[hash(value)].append({
-                            'content': value,
-                            'path': '/'.join(str(p) for p in path + [key])
-                        })
-                    self.traverse(value, path + [key])
-                    
-            elif isinstance(data, list):
-                for i, value in enumerate(data):
-                    if self.is_interesting(value):
-                        self.findings[hash(value)].append({
-                            'content': value,
-                            'path': '/'.join(str(p) for p in path + [str(i)])
-                        })
-                    self.traverse(value, path + [str(i)])
+        for i, signature in enumerate(signatures):
+            shared = Counter(j for h in signature for j in index[h] if j > i)
+            for j, count in shared.items():
+                if count >= NEAR_DUPLICATE_THRESHOLD * min(len(signature), len(signatures[j])):
+                    parent[find(j)] = find(i)
                     
-        except Exception:
-            pass
+        groups: DefaultDict[int, List[str]] = defaultdict(list)
+        for i, value in enumerate(values):
+            groups[find(i)].append(value)
+        return [group for group in groups.values() if len(group) > 1]
 
-    def print_findings(self):
-        print("\nInteresting Content")
-        print("=" * 50)
+    def print_findings(self, near_duplicates: bool = False) -> None:
+        lines = ["", "Interesting Content", "=" * 50]
         
-        # Group by frequency
-        by_frequency = defaultdict(list)
-        for _, occurrences in self.findings.items():
-            by_frequency[len(occurrences)].append(occurrences)
+        # Most frequent first; the sort is stable, so equal counts keep the order found
+        for value, paths in sorted(self.findings.items(), key=lambda item: len(item[1]), reverse=True):
+            count = len(paths)
+            lines.append(f"\nFound {count} times: {value}")
+            if count > 1:  # Only show paths if found multiple times
+                lines.append("Locations:")
+                lines.extend(f"  - {path}" for path in paths)
+            lines.append("")
             
-        for count in sorted(by_frequency.keys(), reverse=True):
-            for occurrences in by_frequency[count]:
-                print(f"\nFound {count} times: {occurrences[0]['content']}")
-                if count > 1:  # Only show paths if found multiple times
-                    print("Locations:")
-                    for loc in occurrences:
-                        print(f"  - {loc['path']}")
-                print()
+        if near_duplicates:
+            lines.extend(["", "Near-duplicate Content", "=" * 50])
+            for group in self.near_duplicates():
+                lines.append(f"\nFound {len(group)} similar values:")
+                lines.extend(f"  - {value[:80]}... at {self.findings[value][0]}" for value in group)
+            lines.append("")
+            
+        # One write instead of a print call per line
+        sys.stdout.write("\n".join(lines) + "\n")
 
-def main():
+def main() -> None:
     parser = argparse.ArgumentParser(description='Find interesting content in JSON')
     parser.add_argument('--input_file', help='Input JSON file to analyze')
+    parser.add_argument('--near-duplicates', action='store_true',
+                      help=f'Also cluster interesting values of {NEAR_DUPLICATE_MIN_LENGTH}+ characters '
+                           'that are mostly the same')
     args = parser.parse_args()
     
     try:
-        with open(args.input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
         analyzer = ValueAnalyzer()
-        analyzer.traverse(data)
-        analyzer.print_findings()
+        if ijson is not None:
+            # Stream the file so the whole document is never held in memory
+            with open(args.input_file, 'rb') as f:
+                analyzer.traverse_events(ijson.parse(f))
+        else:
+            with open(args.input_file, 'rb') as f:
+                data = json_utils.loads(f.read())
+            analyzer.traverse(data)
+        analyzer.print_findings(args.near_duplicates)
         
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)